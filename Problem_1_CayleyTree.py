@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 
 
@@ -8,24 +9,51 @@ def generate_cayley_tree(k, P):
     - The root node has degree k.
     - For non-root nodes, each node generates k-1 children.
     - The tree stops growing after level P (nodes at level P are leaves).
+    Each node also gets a radial layout position 'pos': radius = level, and its
+    angle is the middle of an angular slice obtained by splitting the parent's
+    slice evenly among the parent's children (the root owns the full circle).
     """
-    G = nx.Graph()
-    # Add the central (root) node with level 0.
-    G.add_node(0, level=0)
-    current_level = [0]
+    # Node IDs are assigned level by level, so each level's children are a contiguous
+    # ID range and the whole tree can be built with a few NumPy operations per level.
+    current_level = np.array([0])
     next_node = 1
+    parents = [np.empty(0, dtype=np.int64)]
+    children = [np.empty(0, dtype=np.int64)]
+    level_sizes = [1]
+    # Angular slice [slice_start, slice_start + slice_width) of each node, level by level
+    slice_start = np.zeros(1)
+    slice_width = np.full(1, 2 * np.pi)
+    angles = [slice_start + slice_width / 2]
     # Generate nodes level by level until reaching level P.
     for d in range(1, P + 1):
-        new_level = []
-        for node in current_level:
-            # The root node generates k children, while other nodes generate k-1 children.
-            children_count = k if G.nodes[node]['level'] == 0 else k - 1
-            for _ in range(children_count):
-                G.add_node(next_node, level=d)
-                G.add_edge(node, next_node)
-                new_level.append(next_node)
-                next_node += 1
+        # The root node generates k children, while other nodes generate k-1 children.
+        # The root is alone on level 0, so every node of a level has the same count.
+        children_count = k if d == 1 else k - 1
+        level_parents = np.repeat(current_level, children_count)
+        new_level = next_node + np.arange(level_parents.size)
+        # Split each parent's slice evenly among its children: the j-th child of a
+        # parent takes the j-th sub-slice.
+        slice_width = np.repeat(slice_width, children_count) / children_count
+        sibling_rank = np.tile(np.arange(children_count), current_level.size)
+        slice_start = np.repeat(slice_start, children_count) + sibling_rank * slice_width
+        angles.append(slice_start + slice_width / 2)
+        parents.append(level_parents)
+        children.append(new_level)
+        level_sizes.append(new_level.size)
+        next_node += new_level.size
         current_level = new_level
+
+    edges = np.stack([np.concatenate(parents), np.concatenate(children)], axis=1)
+    levels = np.repeat(np.arange(P + 1), level_sizes)
+    angles = np.concatenate(angles)
+    xs = levels * np.cos(angles)
+    ys = levels * np.sin(angles)
+
+    # Add all nodes first so the root exists even when P = 0 (no edges).
+    G = nx.empty_graph(next_node)
+    G.add_edges_from(edges.tolist())
+    nx.set_node_attributes(G, dict(enumerate(levels.tolist())), 'level')
+    nx.set_node_attributes(G, dict(enumerate(zip(xs.tolist(), ys.tolist()))), 'pos')
     return G
 
 
@@ -33,7 +61,9 @@ def plot_tree(G, k, P):
     """
     Plot the structure of the Cayley Tree.
     """
-    pos = nx.spring_layout(G)  # Position nodes using the spring layout
+    # Radial layout precomputed by generate_cayley_tree (level = radius), O(V)
+    # instead of an iterative spring simulation
+    pos = nx.get_node_attributes(G, 'pos')
     plt.figure(figsize=(8, 8))
     nx.draw(G, pos, with_labels=True, node_color='lightblue', edge_color='gray')
     plt.title(f"Cayley Tree with k={k}, P={P}")
@@ -45,13 +75,11 @@ def plot_degree_distribution(G):
     Compute and plot the degree distribution of the tree.
     The x-axis represents the node degree and the y-axis represents the fraction of nodes with that degree.
     """
-    degrees = [deg for _, deg in G.degree()]
-    degree_count = {}
-    for d in degrees:
-        degree_count[d] = degree_count.get(d, 0) + 1
-    # Sort the degree values
-    x = sorted(degree_count.keys())
-    y = [degree_count[d] / G.number_of_nodes() for d in x]
+    degrees = np.fromiter((deg for _, deg in G.degree()), dtype=np.int32)
+    # counts[d] = number of nodes with degree d; keep only the degrees that occur
+    counts = np.bincount(degrees)
+    x = np.nonzero(counts)[0]
+    y = counts[x] / counts.sum()
 
     plt.figure(figsize=(8, 6))
     plt.bar(x, y, color='skyblue')
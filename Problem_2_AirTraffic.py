@@ -5,16 +5,27 @@ We have two data files in the same directory:
    Each line is in the format: <CODE>|<NODE_ID>|<CITY_NAME>
 
    - <NODE_ID> is the numeric ID of the node.
-   - We will use the numeric ID as the node identifier in our graph.
-   - <CITY_NAME> will be stored as a node attribute.
+   - We will use the numeric ID (parsed as an int) as the node identifier in our graph.
+   - <CODE> and <CITY_NAME> are stored in arrays indexed by the node ID.
 
 2) global-net.dat
    Each line contains two numeric IDs representing an undirected edge between those nodes.
 
 """
 
-import networkx as nx
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import matplotlib.pyplot as plt
+from numba import njit
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import shortest_path
+
+# Version of the load_or_build() cache: bump it whenever the saved arrays or the
+# semantics of build_graph() (parsing, dedup rules, ...) change, so old caches are rebuilt
+GRAPH_CACHE_VERSION = 1
 
 
 def build_graph(cities_file='global-cities.dat', network_file='global-net.dat'):
@@ -23,11 +34,22 @@ def build_graph(cities_file='global-cities.dat', network_file='global-net.dat'):
 
     :param cities_file:    Path to the 'global-cities.dat' file
     :param network_file:   Path to the 'global-net.dat' file
-    :return:               A NetworkX undirected Graph (G)
+    :return:               The graph as a scipy CSR adjacency matrix (csr), the array of
+                           node IDs in CSR row order (nodes), the city names (cities) and
+                           airport codes (codes) as object arrays indexed by node ID, and
+                           a dict mapping airport codes to CSR indices (code_to_index)
     """
-    G = nx.Graph()
-
-    # 1) Parse global-cities.dat: add each numeric node ID and store city code and city name
+    # Node IDs in CSR row order
+    nodes = []
+    # Codes and city names in the same order as the cities file
+    city_codes = []
+    city_names = []
+    # Airport code -> CSR index, for O(1) lookups such as "CBR"
+    code_to_index = {}
+    # Node IDs already listed, so a repeated ID keeps its first line and a single CSR row
+    listed_ids = set()
+
+    # 1) Parse global-cities.dat: collect each numeric node ID with its city code and city name
     with open(cities_file, 'r', encoding='utf-8') as f:
         for line in f:
             line = line.strip()
@@ -36,54 +58,357 @@ def build_graph(cities_file='global-cities.dat', network_file='global-net.dat'):
             parts = line.split('|')
             if len(parts) == 3:
                 code = parts[0]  # e.g. "CBR"
-                node_id = parts[1]  # numeric node ID
+                node_id = int(parts[1])  # numeric node ID
                 city_name = parts[2]  # e.g. "Canberra"
+                if node_id in listed_ids:
+                    continue
+                listed_ids.add(node_id)
+
+                code_to_index[code] = len(nodes)
+                nodes.append(node_id)
+                city_codes.append(code)
+                city_names.append(city_name)
+
+    # 2) Parse global-net.dat in one C-level pass: an (E, 2) array of node ID pairs.
+    #    Blank lines are skipped; a line without exactly two IDs raises ValueError.
+    #    reshape keeps an empty file as a (0, 2) array instead of loadtxt's (0, 1).
+    edges = np.loadtxt(network_file, dtype=np.int64, ndmin=2).reshape(-1, 2)
+
+    # Endpoints missing from the cities file still become nodes (with empty city/code)
+    listed_nodes = nodes[:]
+    nodes = np.array(nodes + np.setdiff1d(edges, nodes).tolist(), dtype=np.int64)
+
+    # Structure-of-arrays node attributes: cities[node_id], codes[node_id]
+    max_id = int(nodes.max(initial=0))
+    cities = np.full(max_id + 1, '', dtype=object)
+    cities[listed_nodes] = city_names
+    codes = np.full(max_id + 1, '', dtype=object)
+    codes[listed_nodes] = city_codes
+
+    # Map node IDs to CSR row/column indices through a dense lookup array
+    n = nodes.size
+    node_index = np.full(max_id + 1, -1, dtype=np.int64)
+    node_index[nodes] = np.arange(n)
+    row = node_index[edges[:, 0]]
+    col = node_index[edges[:, 1]]
+
+    # Symmetrise into a CSR adjacency matrix; duplicate and mirrored listings of the
+    # same route are summed by tocsr(), so reset every entry to 1
+    adj = coo_matrix((np.ones(len(row)), (row, col)), shape=(n, n)).tocsr()
+    csr = (adj + adj.T).tocsr()
+    csr.data[:] = 1
+
+    return csr, nodes, cities, codes, code_to_index
+
+
+def load_or_build(cities_file='global-cities.dat', network_file='global-net.dat', cache='graph.npz'):
+    """
+    Return the same values as build_graph(), reading them from a NumPy .npz cache
+    when it was built from these same data files (same absolute paths and
+    modification times) by the current GRAPH_CACHE_VERSION, and (re)building and
+    saving it otherwise. If the cache cannot be written (e.g. a read-only
+    directory), the graph is still returned, just without caching.
 
-                # Store both code and city as attributes
-                G.add_node(node_id, code=code, city=city_name)
+    :param cities_file:    Path to the 'global-cities.dat' file
+    :param network_file:   Path to the 'global-net.dat' file
+    :param cache:          Path of the .npz cache file (the suffix is added if missing)
+    :return:               csr, nodes, cities, codes, code_to_index (see build_graph)
+    """
+    # np.savez_compressed appends .npz, so look for the file under that name too
+    if not cache.endswith('.npz'):
+        cache += '.npz'
+    # The cache is only valid for the exact input files it was built from
+    source_paths = np.array([os.path.abspath(cities_file), os.path.abspath(network_file)])
+    source_mtimes = np.array([os.stat(cities_file).st_mtime_ns, os.stat(network_file).st_mtime_ns])
+
+    if os.path.exists(cache):
+        with np.load(cache) as data:
+            if ('version' in data.files
+                    and data['version'] == GRAPH_CACHE_VERSION
+                    and np.array_equal(data['source_paths'], source_paths)
+                    and np.array_equal(data['source_mtimes'], source_mtimes)):
+                n = data['nodes'].size
+                csr = csr_matrix((np.ones(data['indices'].size), data['indices'], data['indptr']), shape=(n, n))
+                nodes = data['nodes']
+                cities = data['cities'].astype(object)
+                codes = data['codes'].astype(object)
+                code_to_index = {code: i for i, code in enumerate(codes[nodes]) if code}
+                return csr, nodes, cities, codes, code_to_index
+
+    csr, nodes, cities, codes, code_to_index = build_graph(cities_file, network_file)
+    # Fixed-width unicode arrays, so the cache loads without pickle. Write to a temporary
+    # file and rename it, so a failed write never leaves a truncated cache behind.
+    tmp_cache = cache[:-len('.npz')] + '.tmp.npz'
+    try:
+        np.savez_compressed(tmp_cache, indptr=csr.indptr, indices=csr.indices, nodes=nodes,
+                            cities=cities.astype(str), codes=codes.astype(str),
+                            version=GRAPH_CACHE_VERSION,
+                            source_paths=source_paths, source_mtimes=source_mtimes)
+        os.replace(tmp_cache, cache)
+    except OSError:
+        # Caching is only an optimisation: run on without it
+        if os.path.exists(tmp_cache):
+            os.remove(tmp_cache)
+    return csr, nodes, cities, codes, code_to_index
+
+
+def count_edges(csr):
+    """
+    Number of undirected edges in a symmetric CSR adjacency matrix.
+    """
+    # Every edge is stored in both directions, except self-loops which sit on the diagonal once
+    return (csr.nnz + np.count_nonzero(csr.diagonal())) // 2
 
-    with open(network_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+
+def node_degrees(csr):
+    """
+    Degree of every node of a symmetric CSR adjacency matrix, in CSR row order.
+    """
+    # Stored neighbours per row; a self-loop is stored once but adds 2 to the degree
+    # (as in NetworkX), so count the diagonal a second time
+    return np.diff(csr.indptr) + (csr.diagonal() != 0)
+
+
+@njit(cache=True)
+def union_find_roots(indptr, indices, n):
+    """
+    Union-find (with path halving) over the edges of CSR arrays, compiled with numba.
+
+    :param indptr:    CSR row pointer array
+    :param indices:   CSR column index array
+    :param n:         Number of nodes
+    :return:          root[i] = smallest CSR index in the component of node i
+    """
+    root = np.arange(n, dtype=np.int32)
+    for u in range(n):
+        for j in range(indptr[u], indptr[u + 1]):
+            v = indices[j]
+            # Each undirected edge is stored twice; union it only once
+            if v < u:
                 continue
-            parts = line.split()
-            if len(parts) == 2:
-                node1, node2 = parts
-                G.add_edge(node1, node2)
+            a = u
+            while root[a] != a:
+                root[a] = root[root[a]]
+                a = root[a]
+            b = v
+            while root[b] != b:
+                root[b] = root[root[b]]
+                b = root[b]
+            # Hang the larger root under the smaller one, so every root is its component's minimum
+            if a < b:
+                root[b] = a
+            elif b < a:
+                root[a] = b
+    # Roots have smaller indices than their members, so one ascending pass flattens every tree
+    for i in range(n):
+        root[i] = root[root[i]]
+    return root
+
+
+def compute_largest_cc(csr):
+    """
+    Label the connected components of the CSR adjacency matrix in a single
+    union-find pass over its edges.
 
-    return G
+    :param csr:   scipy CSR adjacency matrix of the undirected graph
+    :return:      The number of connected components, and a boolean mask over the
+                  CSR rows selecting the nodes of the largest component
+    """
+    n = csr.shape[0]
+    labels = union_find_roots(csr.indptr, csr.indices, n)
+    num_components = np.count_nonzero(labels == np.arange(n))
+    largest_label = np.bincount(labels).argmax()
+    return num_components, labels == largest_label
+
+
+def extract_component_csr(csr, mask):
+    """
+    Slice the connected component(s) selected by mask out of a CSR adjacency matrix.
+
+    No edge leaves a connected component, so the selected rows already hold only
+    selected columns: a single row slice plus a relabelling of the column indices
+    gives the subgraph, without the intermediate matrix of csr[mask][:, mask].
+
+    :param csr:    scipy CSR adjacency matrix of the undirected graph
+    :param mask:   Boolean mask over the CSR rows selecting whole connected components
+                   (e.g. from compute_largest_cc)
+    :return:       The component subgraph as a CSR matrix whose indices are relabelled
+                   to [0, mask.sum()) in the original row order
+    """
+    rows = csr[mask]
+    new_index = np.cumsum(mask) - 1
+    m = rows.shape[0]
+    return csr_matrix((rows.data, new_index[rows.indices], rows.indptr), shape=(m, m))
+
+
+@njit(cache=True)
+def bfs(indptr, indices, source, n):
+    """
+    Unweighted single-source BFS over CSR arrays, compiled with numba.
+
+    :param indptr:    CSR row pointer array
+    :param indices:   CSR column index array
+    :param source:    CSR index of the start node
+    :param n:         Number of nodes
+    :return:          dist (hops from source, -1 if unreachable) and parent
+                      (BFS predecessor, -1 for the source and unreachable nodes)
+    """
+    dist = np.full(n, -1, dtype=np.int32)
+    parent = np.full(n, -1, dtype=np.int32)
+    queue = np.empty(n, dtype=np.int32)
+    dist[source] = 0
+    queue[0] = source
+    head = 0
+    tail = 1
+    while head < tail:
+        u = queue[head]
+        head += 1
+        for j in range(indptr[u], indptr[u + 1]):
+            v = indices[j]
+            if dist[v] < 0:
+                dist[v] = dist[u] + 1
+                parent[v] = u
+                queue[tail] = v
+                tail += 1
+    return dist, parent
+
+
+@njit(cache=True, nogil=True)
+def brandes_betweenness(indptr, indices, sources, dist):
+    """
+    Brandes betweenness accumulation over CSR arrays, compiled with numba.
 
+    Instead of running its own BFS per source, it reuses precomputed distances:
+    sorting a source's distance row gives its BFS layers, and w is a BFS child
+    of v exactly when dist[w] == dist[v] + 1.
 
-def solve_problem2_q1(G):
+    :param indptr:    CSR row pointer array
+    :param indices:   CSR column index array
+    :param sources:   CSR indices of the BFS sources (all nodes for the exact value)
+    :param dist:      dist[i] = unweighted distances from sources[i] (-1 if unreachable)
+    :return:          Raw (unnormalised) dependency sums, summed over the sources
+    """
+    n = indptr.size - 1
+    betweenness = np.zeros(n)
+    sigma = np.empty(n)
+    delta = np.empty(n)
+    for i in range(sources.size):
+        s = sources[i]
+        d = dist[i]
+        order = np.argsort(d, kind='mergesort')
+        # Count shortest paths layer by layer, moving away from the source
+        sigma[:] = 0.0
+        sigma[s] = 1.0
+        for v in order:
+            if d[v] < 0:
+                continue
+            for j in range(indptr[v], indptr[v + 1]):
+                w = indices[j]
+                if d[w] == d[v] + 1:
+                    sigma[w] += sigma[v]
+        # Accumulate dependencies layer by layer, moving back towards the source
+        delta[:] = 0.0
+        for v in order[::-1]:
+            if d[v] < 0:
+                continue
+            for j in range(indptr[v], indptr[v + 1]):
+                w = indices[j]
+                if d[w] == d[v] + 1:
+                    delta[v] += sigma[v] / sigma[w] * (1.0 + delta[w])
+            if v != s:
+                betweenness[v] += delta[v]
+    return betweenness
+
+
+def parallel_betweenness(indptr, indices, sources, dist, workers=None, block_size=64):
+    """
+    Run brandes_betweenness over fixed-size blocks of the sources on a thread pool.
+
+    The kernel releases the GIL (nogil=True) and writes into its own arrays, so the
+    blocks can run in parallel. The blocks do not depend on the number of workers
+    and their partial sums are added in block order, so the result is bit-for-bit
+    the same on every machine.
+
+    :param indptr:       CSR row pointer array
+    :param indices:      CSR column index array
+    :param sources:      CSR indices of the BFS sources
+    :param dist:         dist[i] = unweighted distances from sources[i] (-1 if unreachable)
+    :param workers:      Number of threads (None = one per CPU core)
+    :param block_size:   Number of sources per kernel call
+    :return:             Raw (unnormalised) dependency sums, as brandes_betweenness
+    """
+    starts = range(0, sources.size, block_size)
+    workers = min(workers or os.cpu_count() or 1, max(len(starts), 1))
+    betweenness = np.zeros(indptr.size - 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        partials = pool.map(
+            lambda lo: brandes_betweenness(indptr, indices, sources[lo:lo + block_size],
+                                           dist[lo:lo + block_size]),
+            starts)
+        # map() yields in block order whichever thread finished first
+        for partial in partials:
+            betweenness += partial
+    return betweenness
+
+
+def hop_counts(csr, batch_size=256):
+    """
+    All-pairs unweighted distances (number of hops) of a CSR adjacency matrix.
+
+    scipy's batched BFS returns float64 rows; they are computed batch_size sources at
+    a time and stored as a small integer type, so the full matrix takes a quarter
+    (int16) of the float64 size and no full-size float64 matrix is ever held.
+
+    :param csr:          scipy CSR adjacency matrix of the undirected graph
+    :param batch_size:   Number of BFS sources per scipy shortest_path call
+    :return:             (n, n) integer array of hop counts, -1 where unreachable
+    """
+    n = csr.shape[0]
+    # Hop counts are below n, so int16 is enough for graphs of up to 32767 nodes
+    dtype = np.int16 if n <= np.iinfo(np.int16).max else np.int32
+    hops = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        dist = shortest_path(csr, directed=False, unweighted=True, indices=np.arange(start, stop))
+        dist[np.isinf(dist)] = -1
+        hops[start:stop] = dist
+    return hops
+
+
+def trace_path(parent, target):
+    """
+    Walk a BFS parent array back from target and return the path (source first).
+    """
+    path = [target]
+    while parent[path[-1]] >= 0:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def solve_problem2_q1(csr):
     """
     Problem2 (Q1):
-      - Print how many nodes and edges are in the undirected graph G.
+      - Print how many nodes and edges are in the undirected graph (CSR adjacency matrix).
     """
-    num_nodes = G.number_of_nodes()
-    num_edges = G.number_of_edges()
+    num_nodes = csr.shape[0]
+    num_edges = count_edges(csr)
     print("=== Problem2 (Q1) ===")
     print("Number of nodes (undirected):", num_nodes)
     print("Number of edges (undirected):", num_edges)
 
 
-def solve_problem2_q2(G):
+def solve_problem2_q2(num_components, largest_csr):
     """
     Problem2 (Q2):
       - How many connected components are in this graph?
       - How many nodes and edges does the largest connected component contain?
-    """
-    # 1) Number of connected components in an undirected graph
-    num_components = nx.number_connected_components(G)
-
-    # 2) Identify the largest connected component (by node count)
-    #    connected_components(G) returns a generator of node sets
-    largest_cc_nodeset = max(nx.connected_components(G), key=len)
 
-    # Create the subgraph for the largest CC
-    largest_cc_subgraph = G.subgraph(largest_cc_nodeset)
-    largest_cc_num_nodes = largest_cc_subgraph.number_of_nodes()
-    largest_cc_num_edges = largest_cc_subgraph.number_of_edges()
+    The component count and the largest component's CSR are computed once
+    in main() by compute_largest_cc() and extract_component_csr().
+    """
+    largest_cc_num_nodes = largest_csr.shape[0]
+    largest_cc_num_edges = count_edges(largest_csr)
 
     # Print the results
     print("=== Problem2 (Q2) ===")
@@ -93,7 +418,7 @@ def solve_problem2_q2(G):
     print("   Edges:", largest_cc_num_edges)
 
 
-def solve_problem2_q3(G):
+def solve_problem2_q3(largest_csr, largest_cities):
     """
     Problem2 (Q3):
       - Denote the largest component as G_largest.
@@ -101,34 +426,26 @@ def solve_problem2_q3(G):
       - Print the city/airport name and the degree (not the node ID).
     """
 
-    # 1) Identify the largest connected component
-    #    connected_components(G) returns sets of nodes. Pick the set with the largest length.
-    largest_cc_nodeset = max(nx.connected_components(G), key=len)
-    # Create a subgraph for the largest connected component
-    G_largest = G.subgraph(largest_cc_nodeset)
-
-    # 2) Compute the degree of each node in G_largest
-    #    G_largest.degree() returns (node, degree)
-    node_degree_pairs = list(G_largest.degree())
-
-    # 3) Sort by degree in descending order
-    #    x[1] is the degree, so we sort by that, reversed.
-    node_degree_pairs.sort(key=lambda x: x[1], reverse=True)
+    # 1) Compute the degree of each node in G_largest
+    degrees = node_degrees(largest_csr)
+    node_degree_pairs = enumerate(degrees.tolist())
 
-    # 4) Take the top 10
-    top_10 = node_degree_pairs[:10]
+    # 2) Select the 10 highest-degree nodes in descending order
+    #    x[1] is the degree. nlargest keeps a 10-element heap (O(N log 10)) instead of
+    #    sorting all N nodes, and breaks ties in the same order as a stable sort would.
+    top_10 = heapq.nlargest(10, node_degree_pairs, key=lambda x: x[1])
 
-    # 5) Print results
+    # 3) Print results
     #    We specifically need city names, not node IDs.
-    #    The city name is stored under the 'city' attribute: G_largest.nodes[node_id]['city'].
+    #    The city name is stored in the largest_cities array: largest_cities[index].
     print("=== Problem2 (Q3) ===")
     print("Top 10 nodes in the largest component by degree:")
-    for node_id, deg in top_10:
-        city_name = G_largest.nodes[node_id]['city']
+    for index, deg in top_10:
+        city_name = largest_cities[index]
         print(f"  - City/Airport: {city_name}, Degree: {deg}")
 
 
-def solve_problem2_q4(G):
+def solve_problem2_q4(largest_csr):
     """
     Problem2 (Q4):
       - Plot the degree distribution of the largest connected component G_largest.
@@ -138,32 +455,19 @@ def solve_problem2_q4(G):
       - Restrict the range of x between the min and max degree, and ignore any points with y=0.
     """
 
-    # 1) Identify the largest connected component
-    largest_cc_nodeset = max(nx.connected_components(G), key=len)
-    G_largest = G.subgraph(largest_cc_nodeset)
+    # 1) G_largest (the largest connected component) is built once in main()
 
     # 2) Compute the degree of each node in G_largest
-    degrees = [d for _, d in G_largest.degree()]
+    degrees = node_degrees(largest_csr)
 
-    # 3) Build a frequency dictionary: degree -> how many nodes have this degree
-    from collections import Counter
-    degree_counts = Counter(degrees)
-
-    # total number of nodes in G_largest
-    n_nodes = G_largest.number_of_nodes()
+    # 3) Find the distinct degrees (sorted) and how many nodes have each one
+    x_vals, degree_counts = np.unique(degrees, return_counts=True)
 
     # 4) Convert to (x, y) pairs where
     #    x = degree,
     #    y = fraction = count_of_nodes_with_that_degree / total_nodes
-    #    Then filter out any with 0 (normally won't appear anyway, but for safety).
-    x_vals = []
-    y_vals = []
-    for deg in sorted(degree_counts.keys()):
-        count = degree_counts[deg]
-        fraction = count / n_nodes
-        if fraction > 0:
-            x_vals.append(deg)
-            y_vals.append(fraction)
+    #    Only degrees that occur are returned, so x stays within [min, max] and y > 0.
+    y_vals = degree_counts / degrees.size
 
     # 5) Plot in normal scale
     plt.figure()  # first figure: normal scale
@@ -189,7 +493,7 @@ def solve_problem2_q4(G):
     plt.show()  # Show the second plot
 
 
-def solve_problem2_q5(G):
+def solve_problem2_q5(largest_csr, largest_dist, largest_cities):
     """
     Problem2 (Q5):
       - What is the (unweighted) diameter of the giant component G_largest?
@@ -197,47 +501,33 @@ def solve_problem2_q5(G):
         printing city/airport names (not node IDs), whose distance equals the diameter.
 
     Steps:
-      1) Extract the largest connected component and create G_largest.
-      2) Use nx.diameter(G_largest) to find the unweighted diameter.
-      3) Use nx.periphery(G_largest) to get all nodes whose eccentricity equals the diameter.
-      4) Pick one of those periphery nodes (p0) and run a BFS or single_source_shortest_path
-         to find which node in G_largest is at distance = diameter (p1).
-      5) Retrieve the actual shortest path between p0 and p1 using nx.shortest_path.
+      1) Take the all-pairs distance matrix of G_largest (batched BFS, computed once in main()).
+      2) The eccentricity of each node is the maximum of its row; the diameter is the largest one.
+      3) The periphery is the set of nodes whose eccentricity equals the diameter.
+      4) Pick one of those periphery nodes (p0) and the first node at distance = diameter (p1).
+      5) Retrieve the actual shortest path with a BFS from p0 and walk its parent array back from p1.
       6) Print city names for each node in that path.
     """
 
-    # 1) Identify the largest connected component
-    largest_cc_nodeset = max(nx.connected_components(G), key=len)
-    G_largest = G.subgraph(largest_cc_nodeset).copy()
+    # 1) largest_dist[i, j] = number of hops between CSR indices i and j (see hop_counts())
 
     # 2) Compute the unweighted diameter of G_largest
-    diameter = nx.diameter(G_largest)
+    eccentricity = largest_dist.max(axis=1)
+    diameter = int(eccentricity.max())
 
     # 3) Get all nodes in the periphery (distance to their farthest node = diameter)
-    #    nx.periphery(G_largest) returns a list of such nodes.
-    periphery_nodes = nx.periphery(G_largest)
+    periphery_nodes = np.flatnonzero(eccentricity == diameter)
 
-    # 4) Pick one of these periphery nodes, say p0
+    # 4) Pick one of these periphery nodes, say p0, and a node p1 at distance = diameter
     p0 = periphery_nodes[0]
+    p1 = int(np.flatnonzero(largest_dist[p0] == diameter)[0])
 
-    # 5) Use BFS (or single_source_shortest_path_length) from p0 to find the node p1
-    #    that is at distance = diameter from p0
-    dist_from_p0 = nx.single_source_shortest_path_length(G_largest, p0)
-    # Find p1 whose distance from p0 is exactly 'diameter'
-    candidates = [n for n, dist in dist_from_p0.items() if dist == diameter]
-    if not candidates:
-        # If for some reason we can't find any node at distance = diameter,
-        # fallback approach: it should not happen theoretically, but just in case:
-        print("No node found at distance = diameter. Something unexpected occurred.")
-        return
-
-    p1 = candidates[0]  # take the first one
-
-    # 6) Retrieve the actual shortest path from p0 to p1
-    path_nodes = nx.shortest_path(G_largest, p0, p1)
+    # 5) Retrieve the actual shortest path from p0 to p1 via the BFS parents
+    _, parent = bfs(largest_csr.indptr, largest_csr.indices, p0, largest_csr.shape[0])
+    path_indices = trace_path(parent, p1)
 
-    # Convert node IDs to city/airport names
-    path_cities = [G_largest.nodes[node]['city'] for node in path_nodes]
+    # Convert CSR indices to city/airport names
+    path_cities = [largest_cities[i] for i in path_indices]
 
     # Print results
     print("=== Problem2 (Q5) ===")
@@ -246,46 +536,40 @@ def solve_problem2_q5(G):
     print(" -> ".join(path_cities))
 
 
-def solve_problem2_q6(G):
+def solve_problem2_q6(csr, nodes, cities, code_to_index):
     """
     Problem2 (Q6):
       - Find the smallest number of flights from Canberra (CBR) to Cape Town (CPT).
       - List the route (airports) by printing the city/airport names only.
 
     Steps:
-      1) Find the node whose 'code' == "CBR" (start) and the node whose 'code' == "CPT" (target).
-      2) Compute the shortest path (unweighted) in the undirected graph.
+      1) Look up the nodes with code "CBR" (start) and "CPT" (target) in code_to_index.
+      2) Compute the shortest path (unweighted) with a BFS from CBR over the CSR.
       3) The smallest number of flights = (length of path in terms of nodes) - 1.
       4) Print the sequence of city/airport names along that path.
     """
 
 
-    # 1) Identify the node IDs for Canberra (CBR) and Cape Town (CPT)
-    start_node = None
-    end_node = None
-
-    for node_id, attrs in G.nodes(data=True):
-        if attrs.get('code') == "CBR":
-            start_node = node_id
-        elif attrs.get('code') == "CPT":
-            end_node = node_id
-
-    if start_node is None or end_node is None:
+    # 1) Identify the CSR indices of Canberra (CBR) and Cape Town (CPT)
+    if "CBR" not in code_to_index or "CPT" not in code_to_index:
         print("Could not find 'CBR' or 'CPT' in the graph. Check data or code attribute.")
         return
 
-    # 2) Compute shortest path from start_node to end_node (unweighted)
-    try:
-        path_nodes = nx.shortest_path(G, source=start_node, target=end_node)
-    except nx.NetworkXNoPath:
+    start_index = code_to_index["CBR"]
+    end_index = code_to_index["CPT"]
+
+    # 2) Compute shortest path from start_index to end_index (unweighted)
+    dist, parent = bfs(csr.indptr, csr.indices, start_index, csr.shape[0])
+    if dist[end_index] < 0:
         print("No path found between Canberra (CBR) and Cape Town (CPT). They may be in different components.")
         return
+    path_indices = trace_path(parent, end_index)
 
-    # 3) Number of flights = number_of_edges = len(path_nodes) - 1
-    num_flights = len(path_nodes) - 1
+    # 3) Number of flights = number_of_edges = len(path_indices) - 1
+    num_flights = len(path_indices) - 1
 
     # 4) Print the route by city names only
-    path_cities = [G.nodes[n]['city'] for n in path_nodes]
+    path_cities = [cities[nodes[i]] for i in path_indices]
 
     print("=== Problem2 (Q6) ===")
     print(f"Smallest number of flights from Canberra (CBR) to Cape Town (CPT): {num_flights}")
@@ -293,68 +577,94 @@ def solve_problem2_q6(G):
     print(" -> ".join(path_cities))
 
 
-def solve_problem2_q7(G):
+def solve_problem2_q7(largest_csr, largest_dist, largest_cities, k=None, seed=0, workers=None):
     """
     Problem2 (Q7):
       - Which airport/city in the largest component G_largest has the highest betweenness?
       - List the top 10 cities with their betweenness value.
 
+    :param k:      Number of sampled BFS sources for the Brandes estimate (None = exact, all nodes)
+    :param seed:   Random seed for the source sample, so repeated runs agree
+    :param workers: Number of threads running the Brandes kernel (None = one per CPU core)
+
     Steps:
-      1) Extract the largest connected component (G_largest).
-      2) Compute betweenness centrality for all nodes in G_largest.
-      3) Sort by betweenness in descending order.
-      4) Print the top 10 nodes, with their city names and betweenness scores.
+      1) Take the largest component's CSR and all-pairs distances built in main().
+      2) Compute betweenness centrality for all nodes in G_largest with the numba Brandes
+         kernel, reusing the distance rows as BFS layers (optionally only k sampled sources),
+         with the sources split across a thread pool.
+      3) Normalise like nx.betweenness_centrality: divide by (n-1)(n-2), scaled by n/k if sampled.
+      4) Sort by betweenness in descending order and print the top 10 nodes,
+         with their city names and betweenness scores.
     """
 
-
-    # 1) Identify the largest connected component
-    largest_cc_nodeset = max(nx.connected_components(G), key=len)
-    G_largest = G.subgraph(largest_cc_nodeset).copy()
+    # 1) largest_dist[i, j] = number of hops between CSR indices i and j
+    n = largest_csr.shape[0]
 
     # 2) Compute betweenness centrality
-    #    Note: For large graphs, this might take time.
-    betweenness_dict = nx.betweenness_centrality(G_largest)
-
-    # 3) Sort nodes by betweenness (descending)
-    sorted_by_bc = sorted(betweenness_dict.items(), key=lambda x: x[1], reverse=True)
-
-    # 4) Take top 10
-    top_10 = sorted_by_bc[:10]
+    if k is not None and k >= n:
+        k = None
+    if k is None:
+        sources = np.arange(n)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(n, size=k, replace=False))
+    # Only a sample needs its own rows; the exact path uses the matrix as is (no copy)
+    source_dist = largest_dist if k is None else largest_dist[sources]
+    betweenness = parallel_betweenness(largest_csr.indptr, largest_csr.indices, sources,
+                                       source_dist, workers)
+
+    # 3) Normalise (each undirected pair is counted once from each end)
+    if n > 2:
+        betweenness *= n / sources.size / ((n - 1) * (n - 2))
+
+    # 4) Sort nodes by betweenness (descending) and take the top 10
+    top_10 = np.argsort(-betweenness, kind='stable')[:10]
 
     print("=== Problem2 (Q7) ===")
     print("Top 10 airports/cities by betweenness (largest connected component):")
-    for node_id, bc_value in top_10:
-        city_name = G_largest.nodes[node_id]['city']
-        print(f"  - City : {city_name}, Betweenness: {bc_value:.6f}")
+    if k is not None:
+        print(f"  (estimated from {k} sampled sources)")
+    for index in top_10:
+        city_name = largest_cities[index]
+        print(f"  - City : {city_name}, Betweenness: {betweenness[index]:.6f}")
 
 
 def main():
     """
     Main entry point: build the graph once, then solve Q1 and Q2.
     """
-    # Build the graph from the .dat files
-    G = build_graph()
+    # Build the graph from the .dat files (or from the cache of a previous run)
+    csr, nodes, cities, codes, code_to_index = load_or_build()
+
+    # Label the connected components once and share the largest one with every question
+    num_components, largest_cc_mask = compute_largest_cc(csr)
+    # Freeze the largest component as its own CSR (indices relabelled to [0, n_largest))
+    # and line up its city names with those indices
+    largest_csr = extract_component_csr(csr, largest_cc_mask)
+    largest_nodes = nodes[largest_cc_mask]
+    largest_cities = cities[largest_nodes]
+    # All-pairs hop counts of the largest component from batched, compiled BFS (Q5, Q7)
+    largest_dist = hop_counts(largest_csr)
 
     # Q1: Print number of nodes and edges
-    solve_problem2_q1(G)
+    solve_problem2_q1(csr)
 
     # Q2: Connected components info
-    solve_problem2_q2(G)
+    solve_problem2_q2(num_components, largest_csr)
 
     # Q3: top 10 nodes in G having the highest degree
-    solve_problem2_q3(G)
+    solve_problem2_q3(largest_csr, largest_cities)
 
     # Q4: Plot degree distribution
-    solve_problem2_q4(G)
+    solve_problem2_q4(largest_csr)
 
     # Q5: List a longest (unweighted) shortest path between two cities
-    solve_problem2_q5(G)
+    solve_problem2_q5(largest_csr, largest_dist, largest_cities)
 
     # Q6: The smallest number of flights from Canberra (CBR) to Cape Town (CPT)
-    solve_problem2_q6(G)
+    solve_problem2_q6(csr, nodes, cities, code_to_index)
 
     # Q7: Top10 cities have the largest betweeness
-    solve_problem2_q7(G)
+    solve_problem2_q7(largest_csr, largest_dist, largest_cities)
 
 
 if __name__ == '__main__':